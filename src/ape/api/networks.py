@@ -417,6 +417,19 @@ class NetworkAPI(BaseInterfaceModel):
 
         return self._network_config.get("block_time", 0)  # type: ignore
 
+    @property
+    def code_is_immutable(self) -> bool:
+        """
+        ``True`` when the code of a deployed contract cannot change, making
+        it safe to cache. Local and forked networks can be reverted, so their
+        code is never cached.
+
+        Returns:
+            bool
+        """
+
+        return self.name != LOCAL_NETWORK_NAME and not self.name.endswith("-fork")
+
     @cached_property
     def explorer(self) -> Optional["ExplorerAPI"]:
         """
@@ -3,20 +3,44 @@ import ctypes
 import platform
 import shutil
 import sys
+import threading
 import time
 from abc import ABC
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum, IntEnum
+from functools import partial
 from pathlib import Path
 from signal import SIGINT, SIGTERM, signal
 from subprocess import PIPE, Popen, call
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from eth_typing import HexStr
-from eth_utils import add_0x_prefix
+from eth_utils import add_0x_prefix, to_bytes, to_checksum_address
 from hexbytes import HexBytes
-from pydantic import Field, validator
+from pydantic import Field, PrivateAttr, validator
+from requests import Session
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm  # type: ignore
-from web3 import Web3
+from web3 import HTTPProvider, IPCProvider, Web3, WebsocketProvider
+from web3._utils.encoding import FriendlyJsonSerde
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS, get_request_formatters
+from web3._utils.request import DEFAULT_TIMEOUT, _get_session, cache_session, make_post_request
+from web3.middleware import combine_middlewares, construct_simple_cache_middleware
+from web3.types import RPCEndpoint, RPCResponse
 
 from ape.api.config import PluginConfig
 from ape.api.networks import NetworkAPI
@@ -45,6 +69,31 @@ def raises_not_implemented(fn):
     return inner
 
 
+DEFAULT_BATCH_SIZE = 10
+"""The maximum number of calls in a single JSON-RPC batch request."""
+
+CODE_CACHE_SIZE = 4096
+"""The maximum number of contracts whose code a provider keeps cached."""
+
+EIP7702_DELEGATION_PREFIX = b"\xef\x01\x00"
+"""The code of an account delegating to a contract (``0xef0100 || address``), per EIP-7702."""
+
+
+def _normalize_block_id_str(block_id: str) -> str:
+    # NOTE: Tags (e.g. ``"latest"``) and ``0x``-prefixed values pass through as-is.
+    return add_0x_prefix(HexStr(block_id)) if block_id.isnumeric() else block_id
+
+
+_chain_id_cache_middleware = construct_simple_cache_middleware(
+    cache_class=dict, rpc_whitelist={RPCEndpoint("eth_chainId")}
+)
+
+_BLOCK_ID_NORMALIZERS: Dict[type, Callable[[Any], BlockID]] = {
+    str: _normalize_block_id_str,
+    bytes: HexBytes,
+}
+
+
 class TransactionType(Enum):
     """
     Transaction enumerables type constants defined by
@@ -54,6 +103,15 @@ class TransactionType(Enum):
     STATIC = "0x00"
     DYNAMIC = "0x02"  # EIP-1559
 
+    @classmethod
+    def _missing_(cls, value):
+        # NOTE: Look up types by their integer too, e.g. ``TransactionType(2)``.
+        for member in cls:
+            if int(member.value, 16) == value:
+                return member
+
+        return None
+
 
 class TransactionAPI(BaseInterfaceModel):
     """
@@ -79,9 +137,21 @@ class TransactionAPI(BaseInterfaceModel):
 
     signature: Optional[TransactionSignature] = Field(exclude=True)
 
+    # NOTE: The ``(alias, name)`` of each field shown in ``repr()`` and ``str()``,
+    #   collected once per class rather than building ``.dict()`` on every call.
+    _display_fields: ClassVar[Tuple[Tuple[str, str], ...]] = ()
+
     class Config:
         allow_population_by_field_name = True
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._display_fields = tuple(
+            (field.alias, name)
+            for name, field in cls.__fields__.items()
+            if not field.field_info.exclude
+        )
+
     @property
     def total_transfer_value(self) -> int:
         """
@@ -100,20 +170,25 @@ class TransactionAPI(BaseInterfaceModel):
         Serialize the transaction
         """
 
+    def _iter_display_fields(self) -> Iterator[Tuple[str, Any]]:
+        # NOTE: Matches ``.dict()``, which uses aliases and excludes ``None`` values.
+        for alias, name in self._display_fields:
+            value = getattr(self, name)
+            if value is not None:
+                yield alias, value
+
     def __repr__(self) -> str:
-        data = self.dict()
-        params = ", ".join(f"{k}={v}" for k, v in data.items())
+        params = ", ".join(f"{k}={v}" for k, v in self._iter_display_fields())
         return f"<{self.__class__.__name__} {params}>"
 
     def __str__(self) -> str:
-        data = self.dict()
-        if len(data["data"]) > 9:
-            data["data"] = (
-                "0x" + bytes(data["data"][:3]).hex() + "..." + bytes(data["data"][-3:]).hex()
-            )
-        else:
-            data["data"] = "0x" + bytes(data["data"]).hex()
-        params = "\n  ".join(f"{k}: {v}" for k, v in data.items())
+        # NOTE: ``bytes.hex`` so that ``HexBytes`` data does not get a second ``0x`` prefix.
+        data = bytes.hex(self.data)
+        data = f"0x{data[:6]}...{data[-6:]}" if len(self.data) > 9 else f"0x{data}"
+
+        params = "\n  ".join(
+            f"{k}: {data if k == 'data' else v}" for k, v in self._iter_display_fields()
+        )
         return f"{self.__class__.__name__}:\n  {params}"
 
 
@@ -139,11 +214,14 @@ class ConfirmationsProgressBar:
 
     def __init__(self, confirmations: int):
         self._req_confs = confirmations
-        self._bar = tqdm(range(confirmations))
+        # NOTE: ``tqdm`` throttles re-rendering to ``mininterval`` seconds.
+        self._bar = tqdm(range(confirmations), mininterval=0.5, miniters=1)
         self._confs = 0
+        self._described_confs: Optional[int] = None
 
     def __enter__(self):
-        self._update_bar(0)
+        self._set_description()
+        self._bar.refresh()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -171,10 +249,50 @@ class ConfirmationsProgressBar:
     def _update_bar(self, amount: int):
         self._set_description()
         self._bar.update(amount)
-        self._bar.refresh()
 
     def _set_description(self):
-        self._bar.set_description(f"Confirmations ({self._confs}/{self._req_confs})")
+        if self._confs == self._described_confs:
+            return
+
+        # NOTE: Rendering is left to the throttled ``update()`` (and ``close()``).
+        self._bar.set_description(f"Confirmations ({self._confs}/{self._req_confs})", refresh=False)
+        self._described_confs = self._confs
+
+
+class PollingBackoff:
+    """
+    An adaptive sleep interval for polling a chain. Polling starts at half
+    of the network's block time and backs off exponentially, up to twice
+    the block time, until :meth:`reset` is called (e.g. when a new block arrives).
+    """
+
+    MIN_INTERVAL = 0.25
+    BACKOFF_FACTOR = 1.5
+
+    def __init__(self, block_time: int):
+        self._initial_interval = max(self.MIN_INTERVAL, block_time / 2)
+        self._max_interval = max(self._initial_interval, block_time * 2)
+        self._interval = self._initial_interval
+
+    @property
+    def interval(self) -> float:
+        """
+        The number of seconds the next call to :meth:`sleep` waits.
+        """
+        return self._interval
+
+    def reset(self):
+        """
+        Go back to polling at the initial interval.
+        """
+        self._interval = self._initial_interval
+
+    def sleep(self):
+        """
+        Sleep for the current interval and then back off.
+        """
+        time.sleep(self._interval)
+        self._interval = min(self._interval * self.BACKOFF_FACTOR, self._max_interval)
 
 
 class ReceiptAPI(BaseInterfaceModel):
@@ -192,7 +310,7 @@ class ReceiptAPI(BaseInterfaceModel):
 
     txn_hash: str
     status: TransactionStatusEnum
-    block_number: int
+    block_number: Optional[int] = Field(...)  # ``None`` when still pending
     gas_used: int
     gas_price: int
     gas_limit: int
@@ -233,9 +351,10 @@ class ReceiptAPI(BaseInterfaceModel):
 
     @property
     def _confirmations_occurred(self) -> int:
-        latest_block = self.provider.get_block("latest")
+        return self._get_confirmations_at(self.provider.get_block("latest"))
 
-        if latest_block.number is None:
+    def _get_confirmations_at(self, latest_block: "BlockAPI") -> int:
+        if latest_block.number is None or self.block_number is None:
             return 0
 
         return latest_block.number - self.block_number
@@ -247,18 +366,24 @@ class ReceiptAPI(BaseInterfaceModel):
         Returns:
             :class:`~ape.api.ReceiptAPI`: The receipt that is now confirmed.
         """
-        # Wait for nonce from provider to increment.
-        sender_nonce = self.provider.get_nonce(self.sender)
-        while sender_nonce == self.nonce:  # type: ignore
-            time.sleep(1)
-            sender_nonce = self.provider.get_nonce(self.sender)
+        # NOTE: A receipt with a block number is for a mined transaction, so the sender's
+        # nonce has already incremented and there is no need to check it. Only a pending
+        # receipt has to wait for the nonce and then look up the block it was mined in.
+        latest_block = None
+        if self.block_number is None:
+            latest_block = self._await_nonce_increment()
+            self.block_number = self.provider.get_transaction(self.txn_hash).block_number
 
         if self.required_confirmations == 0:
             # The transaction might not yet be confirmed but
             # the user is aware of this. Or, this is a development environment.
             return self
 
-        confirmations_occurred = self._confirmations_occurred
+        confirmations_occurred = (
+            self._confirmations_occurred
+            if latest_block is None
+            else self._get_confirmations_at(latest_block)
+        )
         if confirmations_occurred >= self.required_confirmations:
             return self
 
@@ -272,17 +397,70 @@ class ReceiptAPI(BaseInterfaceModel):
         logger.info(log_message)
 
         with ConfirmationsProgressBar(self.required_confirmations) as progress_bar:
-            while confirmations_occurred < self.required_confirmations:
-                confirmations_occurred = self._confirmations_occurred
-                progress_bar.confs = confirmations_occurred
+            if self.provider.supports_subscriptions:
+                self._await_confirmations_from_new_heads(progress_bar)
+            else:
+                self._poll_for_confirmations(progress_bar, confirmations_occurred)
+
+        return self
+
+    def _await_nonce_increment(self) -> Optional["BlockAPI"]:
+        backoff = PollingBackoff(self._block_time)
+        latest_block = None
+        if self.required_confirmations > 0:
+            # NOTE: The latest block is needed right after, so request both at once.
+            sender_nonce, latest_block = self.provider._get_nonce_and_latest_block(self.sender)
+        else:
+            sender_nonce = self.provider.get_nonce(self.sender)
 
-                if confirmations_occurred == self.required_confirmations:
+        if sender_nonce == self.nonce:
+            # NOTE: Once the node has accepted the transaction, there is no need to poll the
+            #   nonce; looking up the transaction's block afterwards waits for it to get mined.
+            pending_nonce = self.provider.get_nonce(self.sender, block_id="pending")
+            if pending_nonce > self.nonce:  # type: ignore
+                return None
+
+        while sender_nonce == self.nonce:  # type: ignore
+            backoff.sleep()
+            sender_nonce = self.provider.get_nonce(self.sender)
+            latest_block = None
+
+        return latest_block
+
+    def _await_confirmations_from_new_heads(self, progress_bar: ConfirmationsProgressBar):
+        new_heads = self.provider.subscribe_new_heads()
+        try:
+            # NOTE: Check again in case a block arrived before the subscription started.
+            progress_bar.confs = self._confirmations_occurred
+            if progress_bar.confs >= self.required_confirmations:
+                return
+
+            for block in new_heads:
+                progress_bar.confs = self._get_confirmations_at(block)
+                if progress_bar.confs >= self.required_confirmations:
                     break
 
-                time_to_sleep = int(self._block_time / 2)
-                time.sleep(time_to_sleep)
+        finally:
+            # Stop the subscription.
+            new_heads.close()
 
-        return self
+    def _poll_for_confirmations(
+        self, progress_bar: ConfirmationsProgressBar, confirmations_occurred: int
+    ):
+        backoff = PollingBackoff(self._block_time)
+        while confirmations_occurred < self.required_confirmations:
+            previous_confirmations = confirmations_occurred
+            confirmations_occurred = self._confirmations_occurred
+            progress_bar.confs = confirmations_occurred
+
+            if confirmations_occurred >= self.required_confirmations:
+                break
+
+            if confirmations_occurred > previous_confirmations:
+                # A new block arrived; the next one is about a block-time away.
+                backoff.reset()
+
+            backoff.sleep()
 
 
 class BlockGasAPI(BaseInterfaceModel):
@@ -404,12 +582,15 @@ class ProviderAPI(BaseInterfaceModel):
         """
 
     @abstractmethod
-    def get_nonce(self, address: str) -> int:
+    def get_nonce(self, address: str, block_id: BlockID = "latest") -> int:
         """
         Get the number of times an account has transacted.
 
         Args:
             address (str): The address of the account.
+            block_id (:class:`~ape.types.BlockID`): The block to get the nonce at.
+              Use ``"pending"`` to include transactions that have not been mined yet.
+              Defaults to ``"latest"``.
 
         Returns:
             int
@@ -480,6 +661,38 @@ class ProviderAPI(BaseInterfaceModel):
             :class:`~ape.types.BlockID`: The block for the given ID.
         """
 
+    @property
+    def supports_subscriptions(self) -> bool:
+        """
+        ``True`` when the provider can notify of new blocks using
+        :meth:`~ape.api.providers.ProviderAPI.subscribe_new_heads`
+        instead of having to poll for them.
+        """
+        return False
+
+    def subscribe_new_heads(
+        self, timeout: Optional[float] = None
+    ) -> Generator[BlockAPI, None, None]:
+        """
+        Iterate over new blocks as they are added to the chain.
+        Closing the generator ends the subscription.
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait for each new block.
+              Defaults to ``None``, meaning wait forever.
+
+        Raises:
+            NotImplementedError: Unless overridden.
+              See :py:attr:`~ape.api.providers.ProviderAPI.supports_subscriptions`.
+
+        Returns:
+            Generator[:class:`~ape.api.providers.BlockAPI`]
+        """
+        raise NotImplementedError(
+            f"Provider '{self.name}' does not support subscribing to new blocks. "
+            "Check 'supports_subscriptions' before calling 'subscribe_new_heads'."
+        )
+
     @abstractmethod
     def send_call(self, txn: TransactionAPI) -> bytes:  # Return value of function
         """
@@ -574,6 +787,10 @@ class ProviderAPI(BaseInterfaceModel):
             NotImplementedError: Unless overridden.
         """
 
+    def _get_nonce_and_latest_block(self, address: str) -> Tuple[int, BlockAPI]:
+        # NOTE: Providers that can make both requests in one round-trip override this.
+        return self.get_nonce(address), self.get_block("latest")
+
     def _try_track_receipt(self, receipt: ReceiptAPI):
         if self.chain_manager:
             self.chain_manager.account_history.append(receipt)
@@ -631,6 +848,79 @@ class TestProviderAPI(ProviderAPI):
         return self.config_manager.get_config("test")
 
 
+class _BatchedCall:
+    """
+    The end of the middleware chain of a request in a JSON-RPC batch: ``make_request``
+    records the request and blocks until the batch response for it is available.
+    """
+
+    def __init__(self) -> None:
+        self.request: Optional[Tuple[RPCEndpoint, Any]] = None
+        self.response: Optional[RPCResponse] = None
+        self.sent = threading.Event()
+        self.received = threading.Event()
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.request = (method, params)
+        self.sent.set()
+        self.received.wait()
+        if self.response is None:
+            raise ProviderError(f"Missing response for '{method}' in batch request.")
+
+        return self.response
+
+
+class _SessionHTTPProvider(HTTPProvider):
+    """
+    An ``HTTPProvider`` that posts through its own ``requests.Session``
+    instead of web3.py's per-thread session cache.
+    """
+
+    def __init__(self, endpoint_uri: str, session: Session) -> None:
+        super().__init__(endpoint_uri)
+        self.session = session
+
+    def get_request_headers(self) -> Dict[str, str]:
+        # NOTE: Headers passed to a request replace the session's, so have the
+        #   session's (e.g. the ``request_header``) win over web3.py's defaults.
+        return {**super().get_request_headers(), **self.session.headers}
+
+    def post(self, data: bytes) -> bytes:
+        kwargs = self.get_request_kwargs()
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        response = self.session.post(str(self.endpoint_uri), data=data, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return self.decode_rpc_response(self.post(self.encode_rpc_request(method, params)))
+
+
+class _LatestBlockCache:
+    """
+    Holds the most recently fetched ``"latest"`` block so that polling loops,
+    such as waiting for confirmations or checking the base fee, do not
+    re-request a block the chain has not moved past yet.
+    """
+
+    def __init__(self) -> None:
+        self._block: Optional[BlockAPI] = None
+        self._fetched_at = 0.0
+
+    def get(self, ttl: float) -> Optional[BlockAPI]:
+        if self._block is None or time.monotonic() - self._fetched_at >= ttl:
+            return None
+
+        return self._block
+
+    def update(self, block: BlockAPI):
+        self._block = block
+        self._fetched_at = time.monotonic()
+
+    def clear(self):
+        self._block = None
+
+
 class Web3Provider(ProviderAPI, ABC):
     """
     A base provider mixin class that uses the
@@ -638,8 +928,14 @@ class Web3Provider(ProviderAPI, ABC):
     """
 
     _web3: Web3 = None  # type: ignore
+    _latest_block_cache: _LatestBlockCache = PrivateAttr(default_factory=_LatestBlockCache)
+    # NOTE: The chain ID with the connection it came from.
+    _chain_id: Optional[Tuple[Web3, int]] = None
+    _code_cache: "OrderedDict[str, bytes]" = PrivateAttr(default_factory=OrderedDict)
 
     def update_settings(self, new_settings: dict):
+        self._latest_block_cache.clear()
+        self._code_cache.clear()
         self.disconnect()
         self.provider_settings.update(new_settings)
         self.connect()
@@ -648,9 +944,37 @@ class Web3Provider(ProviderAPI, ABC):
         txn_dict = txn.dict()
         return self._web3.eth.estimate_gas(txn_dict)  # type: ignore
 
+    def estimate_gas_cost_many(self, txns: List[TransactionAPI]) -> List[int]:
+        """
+        Estimate the cost of gas for several transactions, using JSON-RPC batches
+        when the ``enable_batching`` provider setting allows it.
+
+        Args:
+            txns (List[:class:`~ape.api.providers.TransactionAPI`]):
+              The transactions to estimate the gas for.
+
+        Returns:
+            List[int]: The estimated cost of gas of each transaction, in order.
+        """
+
+        if self._supports_batching:
+            try:
+                return self._batch_call([("eth_estimateGas", [txn.dict()]) for txn in txns])
+            except ValueError:
+                # NOTE: A single failed estimate fails the whole batch. Estimate each one
+                #   separately so the failure is raised for the transaction that caused it.
+                pass
+
+        return [self.estimate_gas_cost(txn) for txn in txns]
+
     @property
     def chain_id(self) -> int:
-        return self._web3.eth.chain_id
+        # NOTE: The chain ID does not change on a connection, so only request it once
+        #   for each ``Web3`` instance.
+        if self._chain_id is None or self._chain_id[0] is not self._web3:
+            self._chain_id = (self._web3, self._web3.eth.chain_id)
+
+        return self._chain_id[1]
 
     @property
     def gas_price(self) -> int:
@@ -671,23 +995,128 @@ class Web3Provider(ProviderAPI, ABC):
         return block.gas_data.base_fee
 
     def get_block(self, block_id: BlockID) -> BlockAPI:
-        if isinstance(block_id, str):
-            block_id = HexStr(block_id)
+        if block_id == "latest":
+            # NOTE: A new block is not expected for at least half of the block time.
+            cached_block = self._latest_block_cache.get(ttl=self.network.block_time / 2)
+            if cached_block is not None:
+                return cached_block
 
-            if block_id.isnumeric():
-                block_id = add_0x_prefix(block_id)
+        else:
+            normalize = _BLOCK_ID_NORMALIZERS.get(type(block_id))
+            if normalize is not None:
+                block_id = normalize(block_id)
 
-        block_data = self._web3.eth.get_block(block_id)
-        return self.network.ecosystem.decode_block(block_data)  # type: ignore
+        block_data = self._web3.eth.get_block(block_id)  # type: ignore
+        block = self.network.ecosystem.decode_block(block_data)  # type: ignore
 
-    def get_nonce(self, address: str) -> int:
-        return self._web3.eth.get_transaction_count(address)  # type: ignore
+        if block_id == "latest":
+            self._latest_block_cache.update(block)
+
+        return block
+
+    @property
+    def supports_subscriptions(self) -> bool:
+        # NOTE: Block filters live on the node, so they require a persistent connection
+        # that always reaches the same node.
+        return isinstance(self._web3.provider, (WebsocketProvider, IPCProvider))
+
+    def subscribe_new_heads(
+        self, timeout: Optional[float] = None
+    ) -> Generator[BlockAPI, None, None]:
+        """
+        Iterate over new blocks using a block filter installed on the node.
+
+        **NOTE**: web3.py v5 does not support ``eth_subscribe``, so this still polls,
+        using ``eth_getFilterChanges``. It saves bandwidth rather than requests: the node
+        tracks new blocks and each poll only returns the hashes not yet seen.
+        """
+
+        # The filter is installed now, so blocks mined before the first ``next()``
+        # are still reported.
+        block_filter = self._web3.eth.filter("latest")
+        if block_filter.filter_id is None:
+            raise ProviderError("Failed to install a block filter.")
+
+        # Callers re-check the latest block after subscribing; make sure it is fresh.
+        self._latest_block_cache.clear()
+        return self._iterate_new_heads(block_filter.filter_id, timeout=timeout)
+
+    def _iterate_new_heads(
+        self, filter_id: HexStr, timeout: Optional[float] = None
+    ) -> Generator[BlockAPI, None, None]:
+        backoff = PollingBackoff(self.network.block_time)
+        try:
+            last_block_at = time.monotonic()
+            while True:
+                changes = self._web3.eth.get_filter_changes(filter_id)
+                block_hashes = cast(List[HexBytes], changes)
+                if not block_hashes:
+                    if timeout is not None and time.monotonic() - last_block_at >= timeout:
+                        raise ProviderError(f"No new block after {timeout} seconds.")
+
+                    backoff.sleep()
+                    continue
+
+                backoff.reset()
+                last_block_at = time.monotonic()
+                for block_hash in block_hashes:
+                    yield self.get_block(block_hash)
+
+        finally:
+            self._web3.eth.uninstall_filter(filter_id)
+
+    def get_nonce(self, address: str, block_id: BlockID = "latest") -> int:
+        return self._web3.eth.get_transaction_count(address, block_id)  # type: ignore
+
+    def _get_nonce_and_latest_block(self, address: str) -> Tuple[int, BlockAPI]:
+        cached_block = self._latest_block_cache.get(ttl=self.network.block_time / 2)
+        if cached_block is not None or not self._supports_batching:
+            return self.get_nonce(address), cached_block or self.get_block("latest")
+
+        nonce, block_data = self._batch_call(
+            [
+                ("eth_getTransactionCount", [address, "latest"]),
+                ("eth_getBlockByNumber", ["latest", False]),
+            ]
+        )
+        block = self.network.ecosystem.decode_block(block_data)  # type: ignore
+        self._latest_block_cache.update(block)
+        return nonce, block
 
     def get_balance(self, address: str) -> int:
         return self._web3.eth.get_balance(address)  # type: ignore
 
     def get_code(self, address: str) -> bytes:
-        return self._web3.eth.get_code(address)  # type: ignore
+        if not self.network.code_is_immutable:
+            return self._web3.eth.get_code(address)  # type: ignore
+
+        address = to_checksum_address(address)
+        code = self._code_cache.get(address)
+        if code is not None:
+            self._code_cache.move_to_end(address)
+            return code
+
+        code = self._web3.eth.get_code(address)  # type: ignore
+
+        # NOTE: Don't cache empty code, a contract may still get deployed at the address.
+        #   Nor EIP-7702 delegations, which their account can change or clear at any time.
+        if code and not code.startswith(EIP7702_DELEGATION_PREFIX):
+            self._code_cache[address] = code
+            if len(self._code_cache) > CODE_CACHE_SIZE:
+                self._code_cache.popitem(last=False)
+
+        return code
+
+    def invalidate_code(self, address: str):
+        """
+        Remove the cached code of a contract so that it is requested again,
+        such as after the contract self-destructs.
+
+        Args:
+            address (str): The address of the contract.
+        """
+
+        self._code_cache.pop(to_checksum_address(address), None)
 
     def send_call(self, txn: TransactionAPI) -> bytes:
         return self._web3.eth.call(txn.dict())
@@ -696,8 +1125,37 @@ class Web3Provider(ProviderAPI, ABC):
         if required_confirmations < 0:
             raise TransactionError(message="Required confirmations cannot be negative.")
 
-        receipt_data = self._web3.eth.wait_for_transaction_receipt(HexBytes(txn_hash))
-        txn = self._web3.eth.get_transaction(txn_hash)  # type: ignore
+        txn_hash_bytes = HexBytes(txn_hash)
+
+        txn = receipt_data = None
+        if self._supports_batching:
+            # NOTE: On chains that mine right away, the transaction and its receipt are both
+            #   available now and this is the only request. Otherwise, the receipt is polled
+            #   for below. Without batching, this would be two extra requests, since
+            #   waiting for the receipt starts by requesting it anyway.
+            txn, receipt_data = self._batch_call(
+                [
+                    ("eth_getTransactionByHash", [txn_hash_bytes]),
+                    ("eth_getTransactionReceipt", [txn_hash_bytes]),
+                ]
+            )
+
+        if receipt_data is None:
+            # NOTE: Without confirmations to wait for, the caller is waiting only on this,
+            #   so poll quickly to return as soon as the transaction is mined.
+            block_time = self.network.block_time
+            if required_confirmations == 0 or not block_time:
+                poll_latency = 0.1
+            else:
+                poll_latency = max(0.5, block_time / 4)
+
+            receipt_data = self._web3.eth.wait_for_transaction_receipt(
+                txn_hash_bytes, poll_latency=poll_latency
+            )
+
+        if txn is None:
+            txn = self._web3.eth.get_transaction(txn_hash_bytes)  # type: ignore
+
         receipt = self.network.ecosystem.decode_receipt(
             {
                 "provider": self,
@@ -706,13 +1164,230 @@ class Web3Provider(ProviderAPI, ABC):
                 **receipt_data,
             }
         )
+
+        # NOTE: The receipt is of a mined transaction, so there is nothing left to await.
+        if required_confirmations == 0:
+            return receipt
+
         return receipt.await_confirmations()
 
     def get_events(self, **filter_params) -> Iterator[dict]:
         return iter(self._web3.eth.get_logs(filter_params))  # type: ignore
 
+    def stream_events(
+        self,
+        from_block: int,
+        to_block: int,
+        chunk: int = 2000,
+        in_flight: int = 8,
+        **filter_params,
+    ) -> Iterator[dict]:
+        """
+        Get all logs matching a given set of filter parameters in a block range,
+        requesting ``chunk`` blocks at a time with up to ``in_flight`` requests running
+        at once. Logs are still yielded in block order.
+
+        Args:
+            from_block (int): The first block of the range.
+            to_block (int): The last block of the range (inclusive).
+            chunk (int): The number of blocks to request logs for at once.
+              Defaults to ``2000``.
+            in_flight (int): The maximum number of concurrent requests. Defaults to ``8``.
+            `filter_params`: Filter which logs you get.
+
+        Returns:
+            Iterator[dict]: A dictionary of events.
+        """
+
+        if chunk < 1 or in_flight < 1:
+            raise ProviderError("'chunk' and 'in_flight' must be positive integers.")
+
+        def get_logs(start: int) -> List[dict]:
+            end = min(start + chunk - 1, to_block)
+            params = {**filter_params, "fromBlock": start, "toBlock": end}
+            return self._web3.eth.get_logs(params)  # type: ignore
+
+        futures: Deque[Future] = deque()
+        with self._create_thread_pool(in_flight) as executor:
+            try:
+                for start in range(from_block, to_block + 1, chunk):
+                    futures.append(executor.submit(get_logs, start))
+                    if len(futures) == in_flight:
+                        yield from futures.popleft().result()
+
+                while futures:
+                    yield from futures.popleft().result()
+
+            finally:
+                # NOTE: Don't wait on requests that were not started when the caller stops early.
+                for future in futures:
+                    future.cancel()
+
+    def _create_thread_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        # NOTE: A ``_SessionHTTPProvider`` shares its session between threads. Otherwise,
+        #   web3.py would open (and globally cache) a new session for each worker thread,
+        #   so have the workers use this thread's session instead.
+        provider = self._web3.provider
+        initializer = None
+        if isinstance(provider, HTTPProvider) and not isinstance(provider, _SessionHTTPProvider):
+            session = _get_session(provider.endpoint_uri)  # type: ignore
+            initializer = partial(cache_session, provider.endpoint_uri, session)  # type: ignore
+
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer)
+
+    def _create_http_provider(self, uri: str) -> HTTPProvider:
+        """
+        Create an ``HTTPProvider`` that sends every request, from any thread, through
+        one session of its own: a pool of up to 16 keep-alive connections that sends the
+        ``request_header``. Otherwise, web3.py uses a session per thread from a global
+        cache, with 10 connections and the ``requests`` default headers. That cache
+        also keeps the first session it gets for a URI, so a reconnect would not pick
+        up a new one.
+
+        Args:
+            uri (str): The HTTP(S) URI of the node.
+
+        Returns:
+            ``HTTPProvider``
+        """
+
+        session = Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive", **self.request_header})
+        return _SessionHTTPProvider(uri, session)
+
+    @property
+    def _supports_batching(self) -> bool:
+        return bool(self.provider_settings.get("enable_batching")) and isinstance(
+            self._web3.provider, HTTPProvider
+        )
+
+    def _batch_call(self, methods: List[Tuple[str, List]]) -> List[Any]:
+        """
+        Make several JSON-RPC requests, formatting the params and results the same
+        way the ``web3.eth`` methods do.
+
+        When the ``enable_batching`` provider setting is ``True`` and the connection is
+        over HTTP, the requests are sent as JSON-RPC batches of at most ``batch_size``
+        (a provider setting) calls each. Otherwise, the requests are made one at a time.
+        Batching is opt-in because not every node supports it and some services bill
+        for each call in a batch.
+
+        Args:
+            methods (List[Tuple[str, List]]): Pairs of RPC method names and params.
+
+        Returns:
+            List[Any]: The result of each request, in order.
+        """
+
+        requests = []
+        for method, params in methods:
+            request_formatter = get_request_formatters(RPCEndpoint(method))
+            requests.append((RPCEndpoint(method), request_formatter(params)))  # type: ignore
+
+        if self._supports_batching:
+            batch_size = self.provider_settings.get("batch_size", DEFAULT_BATCH_SIZE)
+            if not isinstance(batch_size, int) or batch_size < 1:
+                raise ProviderError(f"'batch_size' must be a positive integer, not '{batch_size}'.")
+
+            if "chain_id_cache" not in self._web3.middleware_onion:
+                # NOTE: Middlewares such as ``validation`` look up the chain ID for each
+                #   request. It cannot change on a connection, so cache it rather than
+                #   make a request for every call in a batch.
+                self._web3.middleware_onion.inject(
+                    _chain_id_cache_middleware, name="chain_id_cache", layer=0
+                )
+
+            results: List[Any] = []
+            for start in range(0, len(requests), batch_size):
+                end = start + batch_size
+                results.extend(self._send_batch(requests[start:end]))
+
+        else:
+            results = [self._web3.manager.request_blocking(m, p) for m, p in requests]
+
+        formatted_results = []
+        for (method, _), result in zip(requests, results):
+            formatter = PYTHONIC_RESULT_FORMATTERS.get(method)  # type: ignore
+            formatted_results.append(formatter(result) if formatter else result)
+
+        return formatted_results
+
+    def _send_batch(self, requests: List[Tuple[RPCEndpoint, Any]]) -> List[Any]:
+        # NOTE: Each request runs through the middlewares in its own thread until it is
+        #   about to be sent, so the batch holds the requests as the middlewares left them.
+        #   Each response then goes back up through the middlewares of its own request,
+        #   such as ``geth_poa_middleware``, and raises errors the same way web3.py does.
+        middlewares = tuple(self._web3.middleware_onion) + tuple(
+            self._web3.provider.middlewares  # type: ignore
+        )
+        calls = [_BatchedCall() for _ in requests]
+
+        def run(batched_call: _BatchedCall, method: RPCEndpoint, params: Any) -> Any:
+            request_func = combine_middlewares(
+                middlewares, self._web3, batched_call.make_request  # type: ignore
+            )
+            try:
+                return self._web3.manager.formatted_response(request_func(method, params), params)
+            finally:
+                # NOTE: Also unblocks the batch when a middleware returns without sending.
+                batched_call.sent.set()
+
+        with self._create_thread_pool(len(requests)) as executor:
+            futures = []
+            try:
+                # NOTE: One at a time, so that lookups the middlewares make (such as the
+                #   chain ID) are cached by the first request rather than racing.
+                for batched_call, (method, params) in zip(calls, requests):
+                    futures.append(executor.submit(run, batched_call, method, params))
+                    batched_call.sent.wait()
+
+                self._post_batch([c for c in calls if c.request is not None])
+
+            finally:
+                for batched_call in calls:
+                    batched_call.received.set()
+
+            return [future.result() for future in futures]
+
+    def _post_batch(self, calls: List["_BatchedCall"]):
+        if not calls:
+            return
+
+        provider = self._web3.provider
+        requests = [cast(Tuple[RPCEndpoint, Any], c.request) for c in calls]
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+            for request_id, (method, params) in enumerate(requests)
+        ]
+        data = to_bytes(text=FriendlyJsonSerde().json_encode(payload))  # type: ignore
+        if isinstance(provider, _SessionHTTPProvider):
+            raw_response = provider.post(data)
+        else:
+            raw_response = make_post_request(
+                provider.endpoint_uri,  # type: ignore
+                data,
+                **provider.get_request_kwargs(),  # type: ignore
+            )
+
+        responses = provider.decode_rpc_response(raw_response)  # type: ignore
+
+        if not isinstance(responses, list):
+            # The node does not support batching. Fall back to individual requests.
+            for batched_call, (method, params) in zip(calls, requests):
+                batched_call.response = provider.make_request(method, params)  # type: ignore
+
+            return
+
+        responses_by_id = {response.get("id"): response for response in responses}
+        for request_id, batched_call in enumerate(calls):
+            batched_call.response = responses_by_id.get(request_id)
+
     def send_transaction(self, txn: TransactionAPI) -> ReceiptAPI:
         txn_hash = self._web3.eth.send_raw_transaction(txn.serialize_transaction())
+        self._latest_block_cache.clear()
         req_confs = (
             txn.required_confirmations
             if txn.required_confirmations is not None
@@ -334,7 +334,9 @@ class AccountHistory(BaseManager):
         """
 
         self._map = {
-            a: [r for r in receipts if r.block_number <= block_number]
+            a: [
+                r for r in receipts if r.block_number is not None and r.block_number <= block_number
+            ]
             for a, receipts in self.items()
         }
 
@@ -291,7 +291,7 @@ class Ethereum(EcosystemAPI):
             if type_kwarg is None:
                 type_kwarg = TransactionType.DYNAMIC.value
             elif isinstance(type_kwarg, int):
-                type_kwarg = f"0{type_kwarg}"
+                type_kwarg = TransactionType(type_kwarg).value
             elif isinstance(type_kwarg, bytes):
                 type_kwarg = type_kwarg.hex()
 
@@ -11,7 +11,7 @@ from geth.process import BaseGethProcess  # type: ignore
 from geth.wrapper import construct_test_chain_kwargs  # type: ignore
 from pydantic import Extra
 from requests.exceptions import ConnectionError
-from web3 import HTTPProvider, Web3
+from web3 import Web3
 from web3.exceptions import ContractLogicError as Web3ContractLogicError
 from web3.gas_strategies.rpc import rpc_gas_price_strategy
 from web3.middleware import geth_poa_middleware
@@ -155,7 +155,7 @@ class GethProvider(Web3Provider, UpstreamProvider):
         return self.uri
 
     def connect(self):
-        self._web3 = Web3(HTTPProvider(self.uri))
+        self._web3 = Web3(self._create_http_provider(self.uri))
 
         if not self._web3.isConnected():
             if self.network.name != LOCAL_NETWORK_NAME:
@@ -205,7 +205,7 @@ class GethProvider(Web3Provider, UpstreamProvider):
             return chain_config is not None and "clique" in chain_config
 
         # If network is rinkeby, goerli, or kovan (PoA test-nets)
-        if self._web3.eth.chain_id in (4, 5, 42) or is_poa():
+        if self.chain_id in (4, 5, 42) or is_poa():
             self._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
 
         if self.network.name != LOCAL_NETWORK_NAME and self.network.chain_id != self.chain_id:
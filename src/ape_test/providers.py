@@ -70,6 +70,7 @@ class LocalProvider(TestProviderAPI, Web3Provider):
         except TransactionFailed as err:
             raise _get_vm_err(err) from err
 
+        self._latest_block_cache.clear()
         receipt = self.get_transaction(
             txn_hash.hex(), required_confirmations=txn.required_confirmations or 0
         )
@@ -86,13 +87,16 @@ class LocalProvider(TestProviderAPI, Web3Provider):
         if snapshot_id:
             current_hash = self.get_block("latest").hash
             if current_hash != snapshot_id:
+                self._latest_block_cache.clear()
                 return self._tester.revert_to_snapshot(snapshot_id)
 
     def set_timestamp(self, new_timestamp: int):
         self._tester.time_travel(new_timestamp)
 
     def mine(self, num_blocks: int = 1):
-        self._tester.mine_blocks(num_blocks)
+        self._latest_block_cache.clear()
+        # NOTE: Mine through ``EthereumTester`` so that block filters see the new blocks.
+        self._web3.provider.ethereum_tester.mine_blocks(num_blocks)  # type: ignore
 
 
 def _get_vm_err(web3_err: TransactionFailed) -> ContractLogicError:
@@ -1,7 +1,12 @@
 import pytest
 
 from ape.exceptions import OutOfGasError
-from ape_ethereum.ecosystem import BaseTransaction, Receipt, TransactionStatusEnum
+from ape_ethereum.ecosystem import (
+    BaseTransaction,
+    Receipt,
+    StaticFeeTransaction,
+    TransactionStatusEnum,
+)
 
 
 class TestBaseTransaction:
@@ -14,6 +19,15 @@ class TestBaseTransaction:
         actual = txn.dict()
         assert "value" not in actual
 
+    def test_repr_and_str_match_dict(self):
+        txn = StaticFeeTransaction(gas_limit=21000, gas_price=1, data=b"\x01" * 10)
+        data = txn.dict()
+        assert repr(txn) == "<StaticFeeTransaction {}>".format(
+            ", ".join(f"{k}={v}" for k, v in data.items())
+        )
+        assert "maxFeePerGas" not in str(txn)
+        assert "data: 0x010101...010101" in str(txn)
+
 
 class TestReceipt:
     def test_raise_for_status_out_of_gas_error(self, mocker):
@@ -1,13 +1,23 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 import pytest
+from hexbytes import HexBytes
+from web3 import HTTPProvider, Web3
+from web3._utils import request as web3_request
 from web3.exceptions import ContractLogicError as Web3ContractLogicError
+from web3.middleware import geth_poa_middleware
 
 from ape.api import ReceiptAPI, TransactionStatusEnum
-from ape.exceptions import ContractLogicError, TransactionError
+from ape.exceptions import ContractLogicError, ProviderError, TransactionError
+from ape_ethereum.ecosystem import StaticFeeTransaction
 from ape_geth import GethProvider
 
 _TEST_REVERT_REASON = "TEST REVERT REASON."
+_TEST_ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
 
 
 def _create_mock_receipt(status=TransactionStatusEnum.NO_ERROR, gas_used=0):
@@ -91,3 +101,404 @@ class TestEthereumProvider:
             provider.send_transaction(mock_transaction)
 
         assert str(err.value) == TransactionError.DEFAULT_MESSAGE
+
+
+class _RPCServer(ThreadingHTTPServer):
+    """
+    A JSON-RPC node that answers a few methods and records the HTTP requests it gets.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RPCRequestHandler)
+        self.uri = f"http://127.0.0.1:{self.server_port}"
+        self.requests: List[Tuple[Dict, Any]] = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def answer(request: Dict) -> Dict:
+        method, params = request["method"], request["params"]
+        if method == "eth_chainId":
+            result: Any = "0x539"
+        elif method == "eth_estimateGas":
+            data = HexBytes(params[0].get("data", "0x"))
+            if data == HexBytes("0xff"):
+                error = {"code": -32000, "message": "Test Error Message"}
+                return {"jsonrpc": "2.0", "id": request["id"], "error": error}
+
+            result = hex(21000 + len(data))
+        elif method == "eth_getLogs":
+            result = [{"logIndex": params[0]["fromBlock"]}, {"logIndex": params[0]["toBlock"]}]
+        else:
+            result = "0x1"
+
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+
+class _RPCRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:  # type: ignore
+            self.server.requests.append((dict(self.headers), payload))  # type: ignore
+
+        if isinstance(payload, list):
+            response: Any = [_RPCServer.answer(request) for request in payload]
+        else:
+            response = _RPCServer.answer(payload)
+
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rpc_server():
+    server = _RPCServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_create_http_provider(rpc_server, mock_network_api, mock_config_item):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={},
+        data_folder=Path("."),
+        request_header={"User-Agent": "test"},
+    )
+    http_provider = provider._create_http_provider(rpc_server.uri)
+    assert http_provider.session.get_adapter(rpc_server.uri)._pool_maxsize == 16
+    assert Web3(http_provider).eth.chain_id == 1337
+
+    # Reconnecting uses the new session, rather than the first one for the URI.
+    provider.request_header = {"User-Agent": "test-reconnected"}
+    assert Web3(provider._create_http_provider(rpc_server.uri)).eth.chain_id == 1337
+
+    user_agents = [headers["User-Agent"] for headers, _ in rpc_server.requests]
+    assert user_agents == ["test", "test-reconnected"]
+    assert all(headers["Connection"] == "keep-alive" for headers, _ in rpc_server.requests)
+
+
+def test_get_code_is_cached(mock_web3, mock_network_api, mock_config_item):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={},
+        data_folder=Path("."),
+        request_header="",
+    )
+    provider._web3 = mock_web3
+    provider.network.code_is_immutable = True
+    mock_web3.eth.get_code.return_value = b"\x60\x80"
+
+    assert provider.get_code(_TEST_ADDRESS.lower()) == b"\x60\x80"
+    assert provider.get_code(_TEST_ADDRESS) == b"\x60\x80"
+    mock_web3.eth.get_code.assert_called_once_with(_TEST_ADDRESS)
+
+    provider.invalidate_code(_TEST_ADDRESS)
+    provider.get_code(_TEST_ADDRESS)
+    assert mock_web3.eth.get_code.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "code",
+    (
+        b"",
+        # An EIP-7702 delegation, which the account may change at any time.
+        b"\xef\x01\x00" + HexBytes(_TEST_ADDRESS),
+    ),
+)
+def test_get_code_not_cached(mock_web3, mock_network_api, mock_config_item, code):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={},
+        data_folder=Path("."),
+        request_header="",
+    )
+    provider._web3 = mock_web3
+    provider.network.code_is_immutable = True
+    mock_web3.eth.get_code.return_value = code
+
+    assert provider.get_code(_TEST_ADDRESS) == code
+    assert provider.get_code(_TEST_ADDRESS) == code
+    assert mock_web3.eth.get_code.call_count == 2
+
+
+def test_get_transaction_without_batching(mock_web3, mock_network_api, mock_config_item):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={},
+        data_folder=Path("."),
+        request_header="",
+    )
+    provider._web3 = mock_web3
+    txn_hash = f"0x{'33' * 32}"
+    mock_web3.eth.wait_for_transaction_receipt.return_value = {"blockNumber": 2}
+    mock_web3.eth.get_transaction.return_value = {"nonce": 1}
+
+    provider.get_transaction(txn_hash)
+
+    # Waits for the receipt first, then gets the transaction, as one request each.
+    mock_web3.eth.wait_for_transaction_receipt.assert_called_once()
+    mock_web3.eth.get_transaction.assert_called_once_with(HexBytes(txn_hash))
+    assert not mock_web3.manager.mock_calls
+    receipt_data = provider.network.ecosystem.decode_receipt.call_args[0][0]
+    assert receipt_data["nonce"] == 1
+    assert receipt_data["blockNumber"] == 2
+
+
+@pytest.fixture
+def rpc_provider(rpc_server, mock_network_api, mock_config_item):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={},
+        data_folder=Path("."),
+        request_header={"User-Agent": "test"},
+    )
+    provider._web3 = Web3(provider._create_http_provider(rpc_server.uri))
+    return provider
+
+
+@pytest.mark.parametrize("session_provider", (True, False))
+def test_stream_events(mocker, rpc_server, rpc_provider, session_provider):
+    if not session_provider:
+        rpc_provider._web3 = Web3(HTTPProvider(rpc_server.uri))
+
+    create_session = mocker.spy(web3_request.requests, "Session")
+
+    logs = rpc_provider.stream_events(0, 9, chunk=2, in_flight=3)
+
+    assert [log["logIndex"] for log in logs] == list(range(10))
+    assert len(rpc_server.requests) == 5
+    # The worker threads share the connection's session rather than opening their own.
+    assert create_session.call_count <= 1
+    if session_provider:
+        assert all(headers["User-Agent"] == "test" for headers, _ in rpc_server.requests)
+
+
+def test_estimate_gas_cost_many(rpc_server, rpc_provider):
+    rpc_provider.provider_settings["enable_batching"] = True
+    txns = [
+        StaticFeeTransaction(chain_id=1337, sender=_TEST_ADDRESS, data=b"\x01" * i)
+        for i in range(3)
+    ]
+
+    assert rpc_provider.estimate_gas_cost_many(txns) == [21000, 21001, 21002]
+
+    # With the default middlewares, validating the transactions needs the chain ID once.
+    # Then all the estimates go out in a single batch.
+    payloads = [payload for _, payload in rpc_server.requests]
+    assert len(payloads) == 2
+    assert payloads[0]["method"] == "eth_chainId"
+    assert [r["params"][0]["data"] for r in payloads[1]] == ["0x", "0x01", "0x0101"]
+
+
+def test_estimate_gas_cost_many_error(rpc_server, rpc_provider):
+    rpc_provider.provider_settings["enable_batching"] = True
+    txns = [
+        StaticFeeTransaction(chain_id=1337, sender=_TEST_ADDRESS),
+        StaticFeeTransaction(chain_id=1337, sender=_TEST_ADDRESS, data=b"\xff"),
+    ]
+
+    with pytest.raises(TransactionError, match="Test Error Message"):
+        rpc_provider.estimate_gas_cost_many(txns)
+
+    # The chain ID, the batch, then each estimate again on its own to isolate the error.
+    methods = [
+        [r["method"] for r in payload] if isinstance(payload, list) else payload["method"]
+        for _, payload in rpc_server.requests
+    ]
+    assert methods == [
+        "eth_chainId",
+        ["eth_estimateGas", "eth_estimateGas"],
+        "eth_estimateGas",
+        "eth_estimateGas",
+    ]
+
+
+_TEST_POA_BLOCK = {
+    "number": "0x1",
+    "hash": f"0x{'11' * 32}",
+    "parentHash": f"0x{'22' * 32}",
+    # NOTE: Clique PoA blocks carry a 97-byte signature in ``extraData``.
+    "extraData": f"0x{'00' * 97}",
+}
+
+
+@pytest.fixture
+def batching_provider(mocker, mock_network_api, mock_config_item):
+    provider = GethProvider(
+        name="test",
+        network=mock_network_api,
+        config=mock_config_item,
+        provider_settings={"enable_batching": True},
+        data_folder=Path("."),
+        request_header="",
+    )
+    provider._web3 = Web3(HTTPProvider("http://127.0.0.1:8545"))
+    provider.network.block_time = 10
+    return provider
+
+
+@pytest.fixture
+def mock_post(mocker):
+    return mocker.patch("ape.api.providers.make_post_request")
+
+
+def _batch_response(*responses) -> bytes:
+    return json.dumps(
+        [{"jsonrpc": "2.0", "id": i, **response} for i, response in enumerate(responses)]
+    ).encode()
+
+
+class TestBatchCall:
+    def test_batch_size(self, batching_provider, mock_post):
+        batching_provider.provider_settings["batch_size"] = 1
+        mock_post.side_effect = [
+            _batch_response({"result": "0x5"}),
+            _batch_response({"result": "0x5208"}),
+        ]
+
+        results = batching_provider._batch_call(
+            [
+                ("eth_getTransactionCount", [_TEST_ADDRESS, "latest"]),
+                ("eth_getBalance", [_TEST_ADDRESS, "latest"]),
+            ]
+        )
+
+        assert results == [5, 21000]
+        assert mock_post.call_count == 2
+
+    @pytest.mark.parametrize("batch_size", (0, -1, "10"))
+    def test_invalid_batch_size(self, batching_provider, mock_post, batch_size):
+        batching_provider.provider_settings["batch_size"] = batch_size
+        with pytest.raises(ProviderError):
+            batching_provider._batch_call([("eth_blockNumber", [])])
+
+        mock_post.assert_not_called()
+
+    def test_batching_not_supported(self, mocker, batching_provider, mock_post):
+        mock_post.return_value = json.dumps(
+            {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "No batches"}}
+        ).encode()
+        make_request = mocker.patch.object(batching_provider._web3.provider, "make_request")
+        make_request.side_effect = [{"result": "0x5"}, {"result": "0x6"}]
+
+        results = batching_provider._batch_call([("eth_blockNumber", []), ("eth_blockNumber", [])])
+
+        assert results == [5, 6]
+        assert make_request.call_count == 2
+
+    def test_request_middlewares(self, batching_provider, mock_post):
+        def middleware(make_request, w3):
+            def fn(method, params):
+                return make_request(method, [params[0], "pending"])
+
+            return fn
+
+        batching_provider._web3.middleware_onion.add(middleware)
+        mock_post.return_value = _batch_response({"result": "0x5"})
+
+        batching_provider._batch_call([("eth_getTransactionCount", [_TEST_ADDRESS, "latest"])])
+
+        # The batch holds the request as the middlewares made it.
+        (request,) = json.loads(mock_post.call_args[0][1])
+        assert request["params"] == [_TEST_ADDRESS, "pending"]
+
+    def test_error_response(self, batching_provider, mock_post):
+        error = {"code": -32000, "message": "Test Error Message"}
+        mock_post.return_value = _batch_response({"result": "0x5"}, {"error": error})
+
+        with pytest.raises(ValueError) as err:
+            batching_provider._batch_call([("eth_blockNumber", []), ("eth_blockNumber", [])])
+
+        assert err.value.args[0] == error
+
+    def test_missing_response(self, batching_provider, mock_post):
+        mock_post.return_value = _batch_response({"result": "0x5"})
+
+        with pytest.raises(ProviderError):
+            batching_provider._batch_call([("eth_blockNumber", []), ("eth_blockNumber", [])])
+
+    def test_poa_block(self, batching_provider, mock_post):
+        batching_provider._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        mock_post.return_value = _batch_response({"result": _TEST_POA_BLOCK})
+
+        (block,) = batching_provider._batch_call([("eth_getBlockByNumber", ["latest", False])])
+
+        assert block["number"] == 1
+        assert block["proofOfAuthorityData"] == HexBytes(_TEST_POA_BLOCK["extraData"])
+
+    def test_get_nonce_and_latest_block(self, mocker, batching_provider, mock_post):
+        batching_provider._web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        decode_block = batching_provider.network.ecosystem.decode_block
+        mock_post.return_value = _batch_response({"result": "0x5"}, {"result": _TEST_POA_BLOCK})
+
+        nonce, block = batching_provider._get_nonce_and_latest_block(_TEST_ADDRESS)
+
+        assert nonce == 5
+        assert block == decode_block.return_value
+        assert decode_block.call_args[0][0]["number"] == 1
+        assert mock_post.call_count == 1
+
+        # The latest block is cached now, so only the nonce is requested.
+        get_nonce = mocker.patch.object(GethProvider, "get_nonce", return_value=6)
+        assert batching_provider._get_nonce_and_latest_block(_TEST_ADDRESS) == (6, block)
+        get_nonce.assert_called_once_with(_TEST_ADDRESS)
+        assert mock_post.call_count == 1
+
+    def test_get_transaction(self, batching_provider, mock_post):
+        txn_hash = f"0x{'33' * 32}"
+        txn = {"hash": txn_hash, "nonce": "0x1"}
+        receipt = {"transactionHash": txn_hash, "blockNumber": "0x2", "status": "0x1"}
+        mock_post.return_value = _batch_response({"result": txn}, {"result": receipt})
+        decode_receipt = batching_provider.network.ecosystem.decode_receipt
+
+        actual = batching_provider.get_transaction(txn_hash)
+
+        # No confirmations are required, so there is nothing to await.
+        assert actual == decode_receipt.return_value
+        decode_receipt.return_value.await_confirmations.assert_not_called()
+        receipt_data = decode_receipt.call_args[0][0]
+        assert receipt_data["nonce"] == 1
+        assert receipt_data["blockNumber"] == 2
+        # Both were fetched in a single request.
+        assert mock_post.call_count == 1
+
+    @pytest.mark.parametrize("required_confirmations,poll_latency", ((0, 0.1), (1, 2.5)))
+    def test_get_transaction_pending(
+        self, mocker, batching_provider, mock_post, required_confirmations, poll_latency
+    ):
+        txn_hash = f"0x{'33' * 32}"
+        txn = {"hash": txn_hash, "nonce": "0x1"}
+        mock_post.return_value = _batch_response({"result": txn}, {"result": None})
+        wait_for_receipt = mocker.patch.object(
+            batching_provider._web3.eth, "wait_for_transaction_receipt"
+        )
+        wait_for_receipt.return_value = {"blockNumber": 2}
+        decode_receipt = batching_provider.network.ecosystem.decode_receipt
+
+        batching_provider.get_transaction(txn_hash, required_confirmations=required_confirmations)
+
+        assert wait_for_receipt.call_args[1]["poll_latency"] == poll_latency
+        assert decode_receipt.call_args[0][0]["blockNumber"] == 2
+        await_confirmations = decode_receipt.return_value.await_confirmations
+        assert await_confirmations.call_count == required_confirmations
@@ -14,3 +14,11 @@ def test_create_static_fee_transaction(ethereum, type_kwarg):
 def test_create_dynamic_fee_transaction(ethereum, type_kwarg):
     txn = ethereum.create_transaction(type=type_kwarg)
     assert txn.type == TransactionType.DYNAMIC.value
+
+
+@pytest.mark.parametrize(
+    "txn_type,expected", ((TransactionType.STATIC, 0), (TransactionType.DYNAMIC, 2))
+)
+def test_transaction_type_from_int(txn_type, expected):
+    assert TransactionType(expected) is txn_type
+    assert TransactionType(txn_type.value) is txn_type
@@ -10,3 +10,10 @@ def test_get_block(eth_tester_provider, block_id):
     assert latest_block.number == 0
     assert latest_block.gas_data.base_fee == 1000000000
     assert latest_block.gas_data.gas_used == 0
+
+
+@pytest.mark.parametrize(
+    "network_name,expected", (("local", False), ("mainnet-fork", False), ("mainnet", True))
+)
+def test_code_is_immutable(ethereum, network_name, expected):
+    assert ethereum[network_name].code_is_immutable is expected
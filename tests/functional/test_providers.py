@@ -0,0 +1,181 @@
+import pytest
+
+from ape.api.providers import PollingBackoff, ProviderAPI
+from ape.exceptions import ProviderError
+from ape_ethereum.ecosystem import Receipt, TransactionStatusEnum
+
+
+@pytest.fixture
+def receipt_provider(mocker):
+    provider = mocker.MagicMock()
+    mocker.patch.object(
+        Receipt, "provider", new_callable=mocker.PropertyMock
+    ).return_value = provider
+    return provider
+
+
+def _create_receipt(**kwargs) -> Receipt:
+    return Receipt(
+        txn_hash="",
+        status=TransactionStatusEnum.NO_ERROR,
+        gas_used=0,
+        gas_limit=0,
+        gas_price=0,
+        sender="",
+        receiver="",
+        nonce=0,
+        **kwargs,
+    )
+
+
+def test_polling_backoff(mocker):
+    sleep = mocker.patch("ape.api.providers.time.sleep")
+    backoff = PollingBackoff(4)
+    for _ in range(5):
+        backoff.sleep()
+
+    assert [c.args[0] for c in sleep.call_args_list] == [2, 3, 4.5, 6.75, 8]
+
+    backoff.reset()
+    assert backoff.interval == 2
+
+
+def test_polling_backoff_without_block_time():
+    backoff = PollingBackoff(0)
+    assert backoff.interval == PollingBackoff.MIN_INTERVAL
+
+
+def test_get_latest_block_is_cached(mocker, eth_tester_provider):
+    mocker.patch.object(
+        type(eth_tester_provider.network), "block_time", new_callable=mocker.PropertyMock
+    ).return_value = 10
+    eth_tester_provider._latest_block_cache.clear()
+    spy = mocker.spy(eth_tester_provider._web3.eth, "get_block")
+
+    block = eth_tester_provider.get_block("latest")
+    assert eth_tester_provider.get_block("latest") == block
+    assert spy.call_count == 1
+
+    # Mining invalidates the cache.
+    eth_tester_provider.mine()
+    assert eth_tester_provider.get_block("latest").number == block.number + 1
+    assert spy.call_count == 2
+
+
+def test_subscribe_new_heads(eth_tester_provider):
+    start_block = eth_tester_provider.get_block("latest").number
+    new_heads = eth_tester_provider.subscribe_new_heads(timeout=5)
+    eth_tester_provider.mine(2)
+
+    assert next(new_heads).number == start_block + 1
+    assert next(new_heads).number == start_block + 2
+    new_heads.close()
+
+
+def test_await_confirmations_from_new_heads(mocker, receipt_provider):
+    provider = receipt_provider
+    provider.supports_subscriptions = True
+    provider.network.block_time = 0
+    provider.network.explorer = None
+    provider.get_block.return_value = mocker.MagicMock(number=0)
+    blocks_seen = []
+
+    def new_heads():
+        for number in range(1, 5):
+            blocks_seen.append(number)
+            yield mocker.MagicMock(number=number)
+
+    provider.subscribe_new_heads.return_value = new_heads()
+    receipt = _create_receipt(block_number=0, required_confirmations=2)
+
+    receipt.await_confirmations()
+
+    # Stopped listening once the second confirmation arrived.
+    assert blocks_seen == [1, 2]
+    # The initial check and the check after subscribing.
+    assert provider.get_block.call_count == 2
+    # The receipt came from a mined transaction, so the nonce was not needed.
+    provider.get_nonce.assert_not_called()
+    provider._get_nonce_and_latest_block.assert_not_called()
+
+
+def test_subscribe_new_heads_timeout(eth_tester_provider):
+    new_heads = eth_tester_provider.subscribe_new_heads(timeout=0)
+    with pytest.raises(ProviderError):
+        next(new_heads)
+
+
+def test_await_confirmations_pending_receipt(mocker, receipt_provider):
+    mocker.patch("ape.api.providers.time.sleep")
+    provider = receipt_provider
+    provider.network.block_time = 0
+    # Latest, pending, then polling the latest nonce.
+    provider.get_nonce.side_effect = [0, 0, 0, 1]
+    provider.get_transaction.return_value.block_number = 5
+    receipt = _create_receipt(block_number=None)
+
+    receipt.await_confirmations()
+
+    assert provider.get_nonce.call_count == 4
+    provider.get_nonce.assert_any_call("", block_id="pending")
+    assert receipt.block_number == 5
+
+
+def test_await_confirmations_accepted_receipt(mocker, receipt_provider):
+    sleep = mocker.patch("ape.api.providers.time.sleep")
+    provider = receipt_provider
+    provider.network.block_time = 0
+    # The pending nonce shows the transaction was accepted.
+    provider.get_nonce.side_effect = [0, 1]
+    provider.get_transaction.return_value.block_number = 5
+    receipt = _create_receipt(block_number=None)
+
+    receipt.await_confirmations()
+
+    assert provider.get_nonce.call_count == 2
+    sleep.assert_not_called()
+    assert receipt.block_number == 5
+
+
+def test_chain_id_is_cached(mocker, eth_tester_provider):
+    chain_id = eth_tester_provider.chain_id
+    web3 = eth_tester_provider._web3
+    mocker.patch.object(web3.eth, "_chain_id", side_effect=AssertionError("Not cached"))
+    assert eth_tester_provider.chain_id == chain_id
+
+
+def test_chain_id_follows_connection(mocker, eth_tester_provider):
+    chain_id = eth_tester_provider.chain_id
+    web3 = mocker.patch.object(eth_tester_provider, "_web3")
+    web3.eth.chain_id = chain_id + 1
+
+    # A new connection does not get the old chain ID.
+    assert eth_tester_provider.chain_id == chain_id + 1
+
+
+def test_stream_events(mocker, eth_tester_provider):
+    web3 = mocker.patch.object(eth_tester_provider, "_web3")
+    web3.eth.get_logs.side_effect = lambda params: [params["fromBlock"], params["toBlock"]]
+
+    logs = eth_tester_provider.stream_events(0, 10, chunk=3, in_flight=2, address="0x")
+
+    assert list(logs) == [0, 2, 3, 5, 6, 8, 9, 10]
+    assert web3.eth.get_logs.call_count == 4
+    assert web3.eth.get_logs.call_args_list[0][0][0]["address"] == "0x"
+
+
+@pytest.mark.parametrize("block_id", (1, "1", "0x1"))
+def test_get_block_by_number(eth_tester_provider, block_id):
+    eth_tester_provider.mine()
+    assert eth_tester_provider.get_block(block_id).number == 1
+
+
+def test_get_block_by_hash_bytes(eth_tester_provider):
+    block = eth_tester_provider.get_block("latest")
+    assert eth_tester_provider.get_block(bytes(block.hash)).number == block.number
+
+
+def test_subscribe_new_heads_not_supported(eth_tester_provider):
+    assert ProviderAPI.subscribe_new_heads.__doc__
+    with pytest.raises(NotImplementedError, match="supports_subscriptions"):
+        ProviderAPI.subscribe_new_heads(eth_tester_provider)